@@ -0,0 +1,182 @@
+"""
+async_converter.py
+------------------
+Asyncio front-end for converter.py.
+File reads and the CPU-bound decode → resize → map stages run in
+executors, so the calling event loop stays responsive while many
+conversions are in flight.
+
+No Tkinter imports — safe to use from headless asyncio services.
+"""
+
+import asyncio
+import io
+from collections import namedtuple
+
+from PIL import Image
+
+from converter import DEFAULT_CHARSET, map_to_ascii, resize_image
+
+# Default number of conversions allowed in flight at once in convert_many()
+DEFAULT_LIMIT = 8
+
+# One item yielded by convert_many(): exactly one of ascii_art / error is set
+ConversionResult = namedtuple("ConversionResult", ["filepath", "ascii_art", "error"])
+
+
+def _read_bytes(filepath):
+    """Read a whole file. Runs in the I/O executor."""
+    with open(filepath, "rb") as f:
+        return f.read()
+
+
+def render_bytes(data, charset=DEFAULT_CHARSET, width=50):
+    """
+    Decode raw image bytes and return ASCII art.
+    Module-level and argument-only so it can be pickled into a
+    ProcessPoolExecutor.
+    """
+    image = Image.open(io.BytesIO(data)).convert("L")
+    return map_to_ascii(resize_image(image, width), charset)
+
+
+async def _start_render(filepath, charset, width, executor):
+    """
+    Read the file, submit the render job, and return the job's future
+    without waiting for it.
+    """
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(None, _read_bytes, filepath)
+    return loop.run_in_executor(executor, render_bytes, data, charset, width)
+
+
+async def convert_async(filepath, charset=DEFAULT_CHARSET, width=50, executor=None, timeout=None):
+    """
+    Convert one image file to ASCII art without blocking the event loop.
+
+    The file is read in the loop's default thread pool; decoding and
+    mapping run in `executor` (a ThreadPoolExecutor or ProcessPoolExecutor),
+    or the default thread pool when None.
+    Raises asyncio.TimeoutError if `timeout` seconds elapse, and whatever
+    the read or decode raised (OSError, PIL.UnidentifiedImageError, ...).
+
+    The timeout clock includes any time spent queued for a free executor
+    worker. A job that has already started cannot be interrupted: on
+    timeout or cancellation it runs to completion and its result is
+    discarded.
+    """
+    charset = charset or DEFAULT_CHARSET
+
+    async def run():
+        job = await _start_render(filepath, charset, width, executor)
+        return await job
+
+    return await asyncio.wait_for(run(), timeout)
+
+
+async def _convert_item(filepath, charset, width, executor, timeout):
+    """
+    Run one convert_many() item.
+
+    Returns (result, job): job is the executor future for the read or
+    render if the item timed out while it was still running, otherwise
+    None. The caller keeps that job's slot occupied until it finishes.
+    """
+    loop = asyncio.get_running_loop()
+    # Whichever executor future is current: the file read, then the render
+    job = None
+
+    async def run():
+        nonlocal job
+        # Both stages are shielded so a timeout leaves the job future
+        # intact to be tracked
+        job = loop.run_in_executor(None, _read_bytes, filepath)
+        data = await asyncio.shield(job)
+        job = loop.run_in_executor(executor, render_bytes, data, charset, width)
+        return await asyncio.shield(job)
+
+    try:
+        return ConversionResult(filepath, await asyncio.wait_for(run(), timeout), None), None
+    except asyncio.TimeoutError as e:
+        lingering = job if job is not None and not job.done() else None
+        return ConversionResult(filepath, None, e), lingering
+    except asyncio.CancelledError:
+        # The shield kept the job alive; drop it too if it has not started
+        if job is not None:
+            job.cancel()
+        raise
+    except Exception as e:
+        return ConversionResult(filepath, None, e), None
+
+
+async def convert_many(
+    filepaths,
+    charset=DEFAULT_CHARSET,
+    width=50,
+    executor=None,
+    limit=DEFAULT_LIMIT,
+    timeout=None,
+):
+    """
+    Convert many image files, yielding a ConversionResult as each finishes.
+
+    At most `limit` conversions are in flight at any time; further paths
+    are only started as earlier ones complete. `timeout` applies to each
+    item separately. A failed or timed-out item is yielded with its
+    exception in `error` rather than aborting the batch.
+
+    A timed-out item is reported straight away, but its slot stays taken
+    until its file read or render job actually finishes, so no more than
+    `limit` reads or renders ever run at once. As with convert_async(),
+    the timeout includes time queued for an executor worker; keep `limit`
+    at or below the executor's worker count if it should only measure
+    run time.
+
+    Closing the generator early, or cancelling the task iterating it,
+    cancels every conversion still in flight.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    charset = charset or DEFAULT_CHARSET
+    pending_paths = iter(filepaths)
+    # Item task → its path, or timed-out executor job → None
+    in_flight = {}
+
+    def start_next():
+        for filepath in pending_paths:
+            task = asyncio.ensure_future(
+                _convert_item(filepath, charset, width, executor, timeout)
+            )
+            in_flight[task] = filepath
+            return True
+        return False
+
+    try:
+        while len(in_flight) < limit and start_next():
+            pass
+
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            results = []
+            for future in done:
+                if in_flight.pop(future) is None:
+                    # A timed-out job finished; its result was already reported
+                    if not future.cancelled():
+                        future.exception()
+                    continue
+                result, lingering = future.result()
+                if lingering is not None:
+                    in_flight[lingering] = None
+                results.append(result)
+
+            # Refill before handing results over so work continues meanwhile
+            while len(in_flight) < limit and start_next():
+                pass
+            for result in results:
+                yield result
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
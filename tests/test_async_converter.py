@@ -0,0 +1,361 @@
+"""
+tests/test_async_converter.py
+-----------------------------
+Unit tests for async_converter.py.
+Drives the coroutines with asyncio.run() — no pytest plugins, no Tkinter.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from PIL import Image
+
+import async_converter
+from async_converter import ConversionResult, convert_async, convert_many, render_bytes
+from converter import DEFAULT_CHARSET, load_image, map_to_ascii, resize_image
+
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+def make_image_file(tmp_path, name="test_image.png", width=40, height=40, brightness=128):
+    """Write a real PNG to a temp file and return its path."""
+    filepath = str(tmp_path / name)
+    Image.new("L", (width, height), color=brightness).save(filepath)
+    return filepath
+
+
+def make_image_files(tmp_path, count, **kwargs):
+    return [make_image_file(tmp_path, f"img_{i}.png", **kwargs) for i in range(count)]
+
+
+async def collect(async_iterable):
+    return [item async for item in async_iterable]
+
+
+def slow_render(delay):
+    """Replacement for render_bytes that sleeps in the worker thread."""
+    def render(data, charset, width):
+        time.sleep(delay)
+        return "slow"
+    return render
+
+
+# ------------------------------------------------------------------
+# convert_async
+# ------------------------------------------------------------------
+
+def test_convert_async_matches_sync_pipeline(tmp_path):
+    filepath = make_image_file(tmp_path)
+    expected = map_to_ascii(resize_image(load_image(filepath), 20), DEFAULT_CHARSET)
+
+    result = asyncio.run(convert_async(filepath, width=20))
+
+    assert result == expected
+
+
+def test_convert_async_empty_charset_falls_back_to_default(tmp_path):
+    filepath = make_image_file(tmp_path, brightness=0)
+
+    result = asyncio.run(convert_async(filepath, charset="", width=5))
+
+    assert set(result.replace("\n", "")) == {DEFAULT_CHARSET[0]}
+
+
+def test_convert_async_raises_on_missing_file():
+    with pytest.raises(OSError):
+        asyncio.run(convert_async("/nonexistent/path/image.png"))
+
+
+def test_convert_async_raises_on_invalid_file(tmp_path):
+    bad_file = tmp_path / "not_an_image.png"
+    bad_file.write_text("this is not an image")
+    with pytest.raises(Exception):
+        asyncio.run(convert_async(str(bad_file)))
+
+
+def test_convert_async_timeout(tmp_path, monkeypatch):
+    filepath = make_image_file(tmp_path)
+    monkeypatch.setattr(async_converter, "render_bytes", slow_render(0.5))
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(convert_async(filepath, timeout=0.05))
+
+
+def test_convert_async_with_process_executor(tmp_path):
+    filepath = make_image_file(tmp_path, brightness=255)
+
+    async def run():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return await convert_async(filepath, charset="AB", width=4, executor=executor)
+
+    assert set(asyncio.run(run()).replace("\n", "")) == {"B"}
+
+
+def test_render_bytes_decodes_raw_bytes(tmp_path):
+    filepath = make_image_file(tmp_path, brightness=0)
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    assert set(render_bytes(data, "XY", 4).replace("\n", "")) == {"X"}
+
+
+# ------------------------------------------------------------------
+# convert_many
+# ------------------------------------------------------------------
+
+def test_convert_many_yields_one_result_per_file(tmp_path):
+    filepaths = make_image_files(tmp_path, 10)
+
+    results = asyncio.run(collect(convert_many(filepaths, width=10)))
+
+    assert sorted(r.filepath for r in results) == sorted(filepaths)
+    assert all(isinstance(r, ConversionResult) for r in results)
+    assert all(r.error is None and r.ascii_art for r in results)
+
+
+def test_convert_many_reports_failures_without_aborting(tmp_path):
+    good = make_image_file(tmp_path)
+    missing = str(tmp_path / "missing.png")
+
+    results = asyncio.run(collect(convert_many([missing, good], width=10)))
+    by_path = {r.filepath: r for r in results}
+
+    assert isinstance(by_path[missing].error, OSError)
+    assert by_path[missing].ascii_art is None
+    assert by_path[good].error is None
+
+
+def test_convert_many_yields_in_completion_order(tmp_path, monkeypatch):
+    slow, fast = make_image_files(tmp_path, 2)
+
+    async def convert(filepath, *args):
+        await asyncio.sleep(0.2 if filepath == slow else 0)
+        return ConversionResult(filepath, "ok", None), None
+
+    monkeypatch.setattr(async_converter, "_convert_item", convert)
+    results = asyncio.run(collect(convert_many([slow, fast])))
+
+    assert [r.filepath for r in results] == [fast, slow]
+
+
+def test_convert_many_respects_limit(tmp_path, monkeypatch):
+    filepaths = make_image_files(tmp_path, 12)
+    state = {"active": 0, "peak": 0}
+
+    async def convert(filepath, *args):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return ConversionResult(filepath, "ok", None), None
+
+    monkeypatch.setattr(async_converter, "_convert_item", convert)
+    results = asyncio.run(collect(convert_many(filepaths, limit=3)))
+
+    assert len(results) == 12
+    assert state["peak"] == 3
+
+
+def test_convert_many_rejects_invalid_limit():
+    with pytest.raises(ValueError):
+        asyncio.run(collect(convert_many([], limit=0)))
+
+
+def test_convert_many_per_item_timeout(tmp_path, monkeypatch):
+    filepaths = make_image_files(tmp_path, 3)
+    monkeypatch.setattr(async_converter, "render_bytes", slow_render(0.5))
+
+    results = asyncio.run(collect(convert_many(filepaths, timeout=0.05)))
+
+    assert len(results) == 3
+    assert all(isinstance(r.error, asyncio.TimeoutError) for r in results)
+
+
+def test_convert_many_timed_out_job_keeps_its_slot(tmp_path, monkeypatch):
+    filepaths = make_image_files(tmp_path, 3)
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def render(data, charset, width):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.2)
+        with lock:
+            state["running"] -= 1
+        return "slow"
+
+    monkeypatch.setattr(async_converter, "render_bytes", render)
+    results = asyncio.run(collect(convert_many(filepaths, limit=1, timeout=0.05)))
+
+    assert all(isinstance(r.error, asyncio.TimeoutError) for r in results)
+    assert state["peak"] == 1
+
+
+def test_convert_many_timed_out_read_keeps_its_slot(tmp_path, monkeypatch):
+    filepaths = make_image_files(tmp_path, 6)
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def read(filepath):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.1)
+        with lock:
+            state["running"] -= 1
+        return b""
+
+    monkeypatch.setattr(async_converter, "_read_bytes", read)
+    results = asyncio.run(collect(convert_many(filepaths, limit=1, timeout=0.02)))
+
+    assert len(results) == 6
+    assert all(isinstance(r.error, asyncio.TimeoutError) for r in results)
+    assert state["peak"] == 1
+
+
+def test_convert_many_cancels_in_flight_work_on_close(tmp_path, monkeypatch):
+    filepaths = make_image_files(tmp_path, 10)
+    started = []
+    cancelled = []
+
+    async def convert(filepath, *args):
+        started.append(filepath)
+        try:
+            await asyncio.sleep(0 if filepath == filepaths[0] else 10)
+        except asyncio.CancelledError:
+            cancelled.append(filepath)
+            raise
+        return ConversionResult(filepath, "ok", None), None
+
+    monkeypatch.setattr(async_converter, "_convert_item", convert)
+
+    async def run():
+        stream = convert_many(filepaths, limit=4)
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    first = asyncio.run(run())
+
+    assert first.filepath == filepaths[0]
+    # Everything still running is cancelled and nothing new gets started
+    assert sorted(started) == sorted(filepaths[:4])
+    assert sorted(cancelled) == sorted(filepaths[1:4])
+
+
+def test_convert_many_cancelling_consumer_cancels_in_flight_work(tmp_path, monkeypatch):
+    filepaths = make_image_files(tmp_path, 4)
+    cancelled = []
+
+    async def convert(filepath, *args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(filepath)
+            raise
+
+    monkeypatch.setattr(async_converter, "_convert_item", convert)
+
+    async def run():
+        consumer = asyncio.ensure_future(collect(convert_many(filepaths)))
+        await asyncio.sleep(0.05)
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+
+    asyncio.run(run())
+
+    assert sorted(cancelled) == sorted(filepaths)
+
+
+# ------------------------------------------------------------------
+# Event-loop responsiveness
+# ------------------------------------------------------------------
+
+async def measure_loop_lag(work, interval=0.005):
+    """
+    Run `work` while a heartbeat coroutine sleeps in short intervals.
+    Returns the worst delay between when a heartbeat was due and when
+    it actually ran.
+    """
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        loop = asyncio.get_running_loop()
+        while not done.is_set():
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lags.append(loop.time() - expected)
+
+    monitor = asyncio.ensure_future(heartbeat())
+    try:
+        await work
+    finally:
+        done.set()
+        await monitor
+    return max(lags)
+
+
+async def convert_all_measuring_lag(filepaths, executor):
+    """Run convert_many() over filepaths with every item in flight at once."""
+    results = []
+
+    async def drain():
+        async for result in convert_many(
+            filepaths, width=120, executor=executor, limit=len(filepaths)
+        ):
+            results.append(result)
+
+    lag = await measure_loop_lag(drain())
+    return results, lag
+
+
+@pytest.mark.parametrize("use_processes", [False, True], ids=["default-threads", "processes"])
+def test_event_loop_stays_responsive_under_load(tmp_path, use_processes):
+    filepaths = make_image_files(tmp_path, 5, width=200, height=200) * 60
+
+    async def run():
+        if not use_processes:
+            return await convert_all_measuring_lag(filepaths, None)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            # Warm the pool up so worker start-up is not measured
+            await convert_async(filepaths[0], width=10, executor=executor)
+            return await convert_all_measuring_lag(filepaths, executor)
+
+    results, lag = asyncio.run(run())
+
+    assert len(results) == 300
+    assert all(r.error is None for r in results)
+    assert lag < 0.1, f"event loop stalled for {lag:.3f}s with 300 conversions in flight"
+
+
+def test_blocking_conversion_stalls_event_loop(tmp_path):
+    """
+    Baseline for the test above: the sync API blocks the loop for as long
+    as it runs. The workload runs for a fixed wall-clock time rather than
+    a fixed image count, so the stall does not depend on machine speed.
+    """
+    filepath = make_image_file(tmp_path, width=200, height=200)
+    duration = 0.3
+
+    async def blocking_work():
+        await asyncio.sleep(0.01)
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            map_to_ascii(resize_image(load_image(filepath), 120), DEFAULT_CHARSET)
+
+    lag = asyncio.run(measure_loop_lag(blocking_work()))
+
+    assert lag >= duration
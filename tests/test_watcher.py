@@ -0,0 +1,505 @@
+"""
+tests/test_watcher.py
+---------------------
+Unit tests for watcher.py.
+Uses real image files in pytest's tmp_path — no Tkinter, runs headless in CI.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+
+import pytest
+from PIL import Image
+
+import watcher
+from watcher import MANIFEST_NAME, FolderWatcher
+
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+def write_image(directory, name, brightness=128, size=(20, 20)):
+    """Write a solid grayscale PNG into directory and return its path."""
+    filepath = directory / name
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("L", size, color=brightness).save(str(filepath))
+    return filepath
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    return source, output
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    """Record every path passed to watcher.hash_file."""
+    calls = []
+    real_hash_file = watcher.hash_file
+
+    def recording_hash_file(filepath):
+        calls.append(filepath)
+        return real_hash_file(filepath)
+
+    monkeypatch.setattr(watcher, "hash_file", recording_hash_file)
+    return calls
+
+
+# ------------------------------------------------------------------
+# Initial sync
+# ------------------------------------------------------------------
+
+def test_first_sync_converts_every_image(dirs):
+    source, output = dirs
+    write_image(source, "a.png")
+    write_image(source, "nested/b.jpg")
+
+    changes = FolderWatcher(source, output).sync()
+
+    assert changes["converted"] == ["a.png", "nested/b.jpg"]
+    assert (output / "a.png.txt").is_file()
+    assert (output / "nested" / "b.jpg.txt").is_file()
+
+
+def test_non_image_files_are_ignored(dirs):
+    source, output = dirs
+    (source / "notes.txt").write_text("hello")
+
+    changes = FolderWatcher(source, output).sync()
+
+    assert changes["converted"] == []
+
+
+def test_render_matches_converter_output(dirs):
+    source, output = dirs
+    write_image(source, "a.png", brightness=0)
+
+    FolderWatcher(source, output, charset="AB", width=4).sync()
+
+    lines = (output / "a.png.txt").read_text(encoding="utf-8").split("\n")
+    assert all(line == "AAAA" for line in lines)
+
+
+def test_manifest_records_file_metadata(dirs):
+    source, output = dirs
+    path = write_image(source, "a.png")
+
+    FolderWatcher(source, output, width=30).sync()
+
+    manifest = json.loads((output / MANIFEST_NAME).read_text())
+    entry = manifest["files"]["a.png"]
+    assert manifest["params"]["width"] == 30
+    assert entry["size"] == path.stat().st_size
+    assert entry["hash"] == watcher.hash_file(str(path))
+    assert entry["output"] == str(output / "a.png.txt")
+
+
+def test_invalid_image_is_reported_as_failed(dirs):
+    source, output = dirs
+    (source / "broken.png").write_text("not an image")
+
+    changes = FolderWatcher(source, output).sync()
+
+    assert changes["failed"] == ["broken.png"]
+    assert not (output / "broken.png.txt").exists()
+
+
+# ------------------------------------------------------------------
+# Incremental sync
+# ------------------------------------------------------------------
+
+def test_second_sync_without_changes_does_nothing(dirs, hash_calls):
+    source, output = dirs
+    write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+    hash_calls.clear()
+
+    changes = folder_watcher.sync()
+
+    assert not any(changes.values())
+    assert hash_calls == []
+
+
+def test_cold_start_uses_manifest_instead_of_rehashing(dirs, hash_calls):
+    source, output = dirs
+    write_image(source, "a.png")
+    write_image(source, "b.png")
+    FolderWatcher(source, output).sync()
+    hash_calls.clear()
+
+    changes = FolderWatcher(source, output).sync()
+
+    assert not any(changes.values())
+    assert hash_calls == []
+
+
+def test_only_modified_image_is_reconverted(dirs):
+    source, output = dirs
+    write_image(source, "a.png", brightness=0)
+    write_image(source, "b.png", brightness=0)
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    write_image(source, "b.png", brightness=255, size=(30, 20))
+    changes = folder_watcher.sync()
+
+    assert changes["converted"] == ["b.png"]
+
+
+def test_touched_but_unchanged_image_is_not_reconverted(dirs):
+    source, output = dirs
+    path = write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    changes = folder_watcher.sync()
+
+    assert changes["converted"] == []
+    assert folder_watcher.manifest["files"]["a.png"]["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+def test_new_image_is_converted(dirs):
+    source, output = dirs
+    write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    write_image(source, "c.png")
+    changes = folder_watcher.sync()
+
+    assert changes["converted"] == ["c.png"]
+
+
+def test_deleted_image_removes_stale_output(dirs):
+    source, output = dirs
+    path = write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    path.unlink()
+    changes = folder_watcher.sync()
+
+    assert changes["removed"] == ["a.png"]
+    assert not (output / "a.png.txt").exists()
+    assert "a.png" not in folder_watcher.manifest["files"]
+
+
+def test_deleted_render_is_regenerated(dirs):
+    source, output = dirs
+    write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    (output / "a.png.txt").unlink()
+    changes = folder_watcher.sync()
+
+    assert changes["converted"] == ["a.png"]
+    assert (output / "a.png.txt").is_file()
+
+
+def test_images_sharing_a_stem_keep_separate_renders(dirs):
+    source, output = dirs
+    write_image(source, "a.png", brightness=0)
+    jpg = write_image(source, "a.jpg", brightness=255)
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    jpg.unlink()
+    changes = folder_watcher.sync()
+
+    assert changes["removed"] == ["a.jpg"]
+    assert (output / "a.png.txt").is_file()
+    assert not (output / "a.jpg.txt").exists()
+    assert not any(folder_watcher.sync().values())
+
+
+def test_failed_image_is_not_retried_until_changed(dirs):
+    source, output = dirs
+    (source / "broken.png").write_text("not an image")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    assert not any(folder_watcher.sync().values())
+
+    write_image(source, "broken.png")
+    assert folder_watcher.sync()["converted"] == ["broken.png"]
+
+
+# ------------------------------------------------------------------
+# Render settings
+# ------------------------------------------------------------------
+
+@pytest.mark.parametrize("settings", [{"width": 20}, {"charset": "AB"}])
+def test_changed_settings_reconvert_everything(dirs, settings):
+    source, output = dirs
+    write_image(source, "a.png")
+    write_image(source, "b.png")
+    FolderWatcher(source, output).sync()
+
+    changes = FolderWatcher(source, output, **settings).sync()
+
+    assert changes["converted"] == ["a.png", "b.png"]
+
+
+def test_unhashable_file_during_settings_change_is_retried(dirs, monkeypatch):
+    source, output = dirs
+    write_image(source, "a.png")
+    write_image(source, "b.png")
+    FolderWatcher(source, output).sync()
+    real_hash_file = watcher.hash_file
+
+    def flaky_hash_file(filepath):
+        if filepath.endswith("b.png"):
+            raise PermissionError(filepath)
+        return real_hash_file(filepath)
+
+    monkeypatch.setattr(watcher, "hash_file", flaky_hash_file)
+    folder_watcher = FolderWatcher(source, output, width=20)
+    assert folder_watcher.sync()["converted"] == ["a.png"]
+
+    monkeypatch.setattr(watcher, "hash_file", real_hash_file)
+    assert FolderWatcher(source, output, width=20).sync()["converted"] == ["b.png"]
+
+
+def test_interrupted_settings_change_resumes_where_it_stopped(dirs, monkeypatch):
+    source, output = dirs
+    for name in ("a.png", "b.png", "c.png"):
+        write_image(source, name)
+    FolderWatcher(source, output).sync()
+    monkeypatch.setattr(watcher, "MANIFEST_SAVE_EVERY", 1)
+    folder_watcher = FolderWatcher(source, output, width=20)
+    real_render = folder_watcher._render
+
+    def crashing_render(rel):
+        if rel == "c.png":
+            raise KeyboardInterrupt
+        return real_render(rel)
+
+    monkeypatch.setattr(folder_watcher, "_render", crashing_render)
+    with pytest.raises(KeyboardInterrupt):
+        folder_watcher.sync()
+
+    changes = FolderWatcher(source, output, width=20).sync()
+
+    assert changes["converted"] == ["c.png"]
+
+
+def test_corrupt_manifest_triggers_full_resync(dirs):
+    source, output = dirs
+    write_image(source, "a.png")
+    FolderWatcher(source, output).sync()
+    (output / MANIFEST_NAME).write_text("{ not json")
+
+    changes = FolderWatcher(source, output).sync()
+
+    assert changes["converted"] == ["a.png"]
+
+
+@pytest.mark.parametrize("files", [
+    {"a.png": {"size": 1}},
+    {"a.png": "not an entry"},
+    ["a.png"],
+])
+def test_malformed_manifest_triggers_full_resync(dirs, files):
+    source, output = dirs
+    write_image(source, "a.png")
+    FolderWatcher(source, output).sync()
+    manifest = json.loads((output / MANIFEST_NAME).read_text())
+    manifest["files"] = files
+    (output / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+    changes = FolderWatcher(source, output).sync()
+
+    assert changes["converted"] == ["a.png"]
+
+
+def test_output_folder_inside_source_is_not_scanned(tmp_path):
+    source = tmp_path / "source"
+    output = source / "renders"
+    write_image(source, "a.png")
+    write_image(output, "decoy.png")
+
+    changes = FolderWatcher(source, output).sync()
+
+    assert changes["converted"] == ["a.png"]
+
+
+# ------------------------------------------------------------------
+# Error handling
+# ------------------------------------------------------------------
+
+def test_unreachable_source_folder_aborts_without_removing(dirs):
+    source, output = dirs
+    write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+
+    source.rename(source.with_name("moved"))
+    with pytest.raises(OSError):
+        folder_watcher.sync()
+
+    assert (output / "a.png.txt").is_file()
+    assert "a.png" in folder_watcher.manifest["files"]
+
+
+def test_unreadable_subfolder_keeps_its_renders(dirs, monkeypatch):
+    source, output = dirs
+    write_image(source, "a.png")
+    write_image(source, "share/b.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+    real_scandir = os.scandir
+
+    def failing_scandir(path):
+        if os.path.basename(path) == "share":
+            raise PermissionError(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", failing_scandir)
+    changes = folder_watcher.sync()
+
+    assert changes["removed"] == []
+    assert (output / "share" / "b.png.txt").is_file()
+
+
+def test_write_failure_is_reported_and_retried(dirs, monkeypatch):
+    source, output = dirs
+    write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+
+    def failing_write(output_path, ascii_art):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(folder_watcher, "_write_output", failing_write)
+    assert folder_watcher.sync()["failed"] == ["a.png"]
+    assert not (output / "a.png.txt").exists()
+
+    monkeypatch.undo()
+    assert folder_watcher.sync()["converted"] == ["a.png"]
+
+
+def test_failed_render_removal_is_retried(dirs, monkeypatch):
+    source, output = dirs
+    path = write_image(source, "a.png")
+    write_image(source, "b.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+    path.unlink()
+    write_image(source, "c.png")
+    real_remove = os.remove
+
+    def busy_remove(filepath):
+        if str(filepath).endswith("a.png.txt"):
+            raise PermissionError(filepath)
+        return real_remove(filepath)
+
+    monkeypatch.setattr(os, "remove", busy_remove)
+    changes = folder_watcher.sync()
+
+    assert changes["failed"] == ["a.png"]
+    assert changes["converted"] == ["c.png"]
+    assert "a.png" in folder_watcher.manifest["files"]
+
+    monkeypatch.undo()
+    assert folder_watcher.sync()["removed"] == ["a.png"]
+    assert not (output / "a.png.txt").exists()
+
+
+def test_stale_render_of_broken_image_is_removed_on_retry(dirs, monkeypatch):
+    source, output = dirs
+    write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    folder_watcher.sync()
+    (source / "a.png").write_text("no longer an image")
+    real_remove = os.remove
+
+    def busy_remove(filepath):
+        raise PermissionError(filepath)
+
+    monkeypatch.setattr(os, "remove", busy_remove)
+    assert folder_watcher.sync()["failed"] == ["a.png"]
+    assert (output / "a.png.txt").exists()
+
+    monkeypatch.setattr(os, "remove", real_remove)
+    assert folder_watcher.sync()["failed"] == ["a.png"]
+    assert not (output / "a.png.txt").exists()
+    assert not any(folder_watcher.sync().values())
+
+
+def test_invalid_width_is_rejected(dirs):
+    source, output = dirs
+    with pytest.raises(ValueError):
+        FolderWatcher(source, output, width=0)
+
+
+@pytest.mark.parametrize("width", ["0", "-5", "abc"])
+def test_cli_rejects_invalid_width(dirs, width):
+    source, output = dirs
+    with pytest.raises(SystemExit):
+        watcher.main([str(source), str(output), "--width", width, "--once"])
+
+
+@pytest.mark.parametrize("interval", ["0", "-1", "nan", "abc"])
+def test_cli_rejects_invalid_interval(dirs, interval):
+    source, output = dirs
+    with pytest.raises(SystemExit):
+        watcher.main([str(source), str(output), "--interval", interval])
+
+
+# ------------------------------------------------------------------
+# watch()
+# ------------------------------------------------------------------
+
+def test_watch_reports_changes_and_stops(dirs):
+    source, output = dirs
+    write_image(source, "a.png")
+    stop_event = threading.Event()
+    reported = []
+
+    def on_change(changes):
+        reported.append(changes)
+        stop_event.set()
+
+    FolderWatcher(source, output).watch(interval=0.01, stop_event=stop_event, on_change=on_change)
+
+    assert reported[0]["converted"] == ["a.png"]
+
+
+def test_watch_survives_a_failing_pass(dirs, monkeypatch):
+    source, output = dirs
+    write_image(source, "a.png")
+    folder_watcher = FolderWatcher(source, output)
+    stop_event = threading.Event()
+    errors = []
+    real_sync = folder_watcher.sync
+
+    def failing_once():
+        if not errors:
+            raise OSError("share unavailable")
+        stop_event.set()
+        return real_sync()
+
+    monkeypatch.setattr(folder_watcher, "sync", failing_once)
+    folder_watcher.watch(interval=0.01, stop_event=stop_event, on_error=errors.append)
+
+    assert len(errors) == 1
+    assert (output / "a.png.txt").is_file()
+
+
+@pytest.mark.parametrize("interval", [0, -1])
+def test_watch_rejects_non_positive_interval(dirs, interval):
+    source, output = dirs
+    with pytest.raises(ValueError):
+        FolderWatcher(source, output).watch(interval=interval)
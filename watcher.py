@@ -0,0 +1,414 @@
+"""
+watcher.py
+----------
+Watch-folder mode for the ASCII Art Generator.
+Keeps a folder of ASCII renders in sync with a folder of source images,
+re-converting only what changed between polls.
+
+A JSON manifest in the output folder records, for every source image,
+its size, mtime, content hash and output path, plus the render settings
+(charset and width) used. Polling only stat()s files; an image is hashed
+only when its size or mtime differs from the manifest, so a cold start
+on an unchanged folder does no hashing and no conversion.
+
+No Tkinter imports — this module is headless and can run as a service.
+
+To run:
+    python watcher.py <source_dir> <output_dir> [--width 50] [--interval 2]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+
+from converter import DEFAULT_CHARSET, load_image, map_to_ascii, resize_image
+
+# Same extensions the file picker in app.py offers
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")
+
+MANIFEST_NAME = ".ascii_manifest.json"
+MANIFEST_VERSION = 2
+
+# Manifest updates between intermediate saves during a long pass
+MANIFEST_SAVE_EVERY = 500
+
+# Read size for content hashing — keeps memory flat for large images
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(filepath):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FolderWatcher:
+    """
+    Keeps output_dir populated with one .txt render per image in source_dir.
+    Call sync() for a single pass, or watch() to poll until stopped.
+    """
+
+    def __init__(self, source_dir, output_dir, charset=DEFAULT_CHARSET, width=50):
+        if width < 1:
+            raise ValueError("width must be at least 1")
+        self.source_dir = os.path.abspath(source_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.charset = charset or DEFAULT_CHARSET
+        self.width = width
+        self.manifest_path = os.path.join(self.output_dir, MANIFEST_NAME)
+
+        # Loaded once; kept in memory between polls and written back on change
+        self.manifest = self._load_manifest()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _params(self):
+        """Render settings that, when changed, invalidate every output."""
+        return {"charset": self.charset, "width": self.width}
+
+    def _load_manifest(self):
+        """
+        Read the manifest from disk.
+        A missing, unreadable, outdated or malformed manifest yields an
+        empty one, which simply means the next sync re-converts everything.
+        """
+        empty = {"version": MANIFEST_VERSION, "params": None, "files": {}}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+            return empty
+        files = manifest.get("files")
+        if not isinstance(manifest.get("params"), (dict, type(None))) or not isinstance(files, dict):
+            return empty
+        if not all(self._is_valid_entry(entry) for entry in files.values()):
+            return empty
+        return manifest
+
+    @staticmethod
+    def _is_valid_entry(entry):
+        """True if a manifest file entry has every field sync() relies on."""
+        return (
+            isinstance(entry, dict)
+            and isinstance(entry.get("size"), int)
+            and isinstance(entry.get("mtime_ns"), int)
+            and isinstance(entry.get("hash"), (str, type(None)))
+            and isinstance(entry.get("output"), (str, type(None)))
+        )
+
+    def _save_manifest(self):
+        """Write the manifest atomically so a crash never leaves it half-written."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _scan(self):
+        """
+        Walk source_dir and return (found, unreadable).
+
+        found maps each image's relative path to its os.stat_result; stat
+        data comes from os.scandir's directory listing where the OS provides
+        it. unreadable is a set of relative paths (directories or files)
+        that could not be listed or stat()ed this pass — their contents are
+        unknown, not deleted. The output folder is skipped if it lives
+        inside the source folder.
+
+        Raises OSError if source_dir itself cannot be listed.
+        """
+        found = {}
+        unreadable = set()
+        # Listing the root is allowed to raise — an unreachable source folder
+        # must abort the pass rather than look like an empty one
+        root_entries = os.scandir(self.source_dir)
+        pending = []
+
+        def walk(entries):
+            with entries:
+                for entry in entries:
+                    rel = os.path.relpath(entry.path, self.source_dir).replace(os.sep, "/")
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if os.path.abspath(entry.path) != self.output_dir:
+                                pending.append(entry.path)
+                        elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                            found[rel] = entry.stat()
+                    except OSError:
+                        unreadable.add(rel)
+
+        walk(root_entries)
+        while pending:
+            directory = pending.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                unreadable.add(os.path.relpath(directory, self.source_dir).replace(os.sep, "/"))
+                continue
+            walk(entries)
+        return found, unreadable
+
+    def _output_path(self, rel):
+        """
+        Map a source-relative image path to its render path.
+        The source extension is kept (a.png → a.png.txt) so images that
+        share a stem never share a render.
+        """
+        return os.path.join(self.output_dir, *(rel + ".txt").split("/"))
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    def _render(self, rel):
+        """Convert one source image to ASCII art. Returns None if it cannot be decoded."""
+        source_path = os.path.join(self.source_dir, *rel.split("/"))
+        try:
+            image = load_image(source_path)
+            return map_to_ascii(resize_image(image, self.width), self.charset)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _write_output(output_path, ascii_art):
+        """Write a render atomically, like _save_manifest(). Raises OSError on failure."""
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        tmp_path = output_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(ascii_art)
+            os.replace(tmp_path, output_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _remove_output(output_path):
+        """Delete a stale render, ignoring one that is already gone."""
+        if not output_path:
+            return
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _is_current(entry, stat):
+        """
+        True if the manifest entry still describes this file and its render
+        is on disk, so the file can be skipped without hashing.
+        An entry whose hash is None is pending and always re-converted.
+        """
+        if entry is None or entry["hash"] is None:
+            return False
+        if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            return False
+        # Failed renders have no output; successful ones must still exist
+        return entry["output"] is None or os.path.exists(entry["output"])
+
+    def sync(self):
+        """
+        Run a single pass: convert new or changed images, drop renders whose
+        source has disappeared, and persist the manifest if anything changed.
+
+        Returns a dict of relative paths:
+            {"converted": [...], "removed": [...], "failed": [...]}
+
+        Raises OSError if source_dir cannot be listed; nothing is removed
+        in that case.
+        """
+        changes = {"converted": [], "removed": [], "failed": []}
+        files = self.manifest["files"]
+
+        scanned, unreadable = self._scan()
+
+        if self.manifest.get("params") != self._params():
+            # Mark every render as pending under the new settings. Saving
+            # this up front keeps periodic saves below consistent: a pass
+            # interrupted half way resumes with only the pending entries.
+            for entry in files.values():
+                entry["hash"] = None
+            self.manifest["params"] = self._params()
+            self._save_manifest()
+
+        unsaved = 0
+
+        def record_change():
+            nonlocal unsaved
+            unsaved += 1
+            if unsaved >= MANIFEST_SAVE_EVERY:
+                self._save_manifest()
+                unsaved = 0
+
+        def is_unreadable(rel):
+            return any(rel == path or rel.startswith(path + "/") for path in unreadable)
+
+        # Sources that no longer exist → remove their renders. Files under a
+        # directory that could not be read this pass are left alone.
+        for rel in sorted(set(files) - set(scanned)):
+            if is_unreadable(rel):
+                continue
+            try:
+                self._remove_output(files[rel]["output"])
+            except OSError:
+                # Keep the entry so the next pass tries the removal again
+                changes["failed"].append(rel)
+                continue
+            del files[rel]
+            changes["removed"].append(rel)
+            record_change()
+
+        for rel in sorted(scanned):
+            stat = scanned[rel]
+            entry = files.get(rel)
+            if self._is_current(entry, stat):
+                continue
+
+            source_path = os.path.join(self.source_dir, *rel.split("/"))
+            try:
+                content_hash = hash_file(source_path)
+            except OSError:
+                # Leave it pending (or absent) so the next pass retries it
+                continue
+
+            if (
+                entry is not None
+                and entry["hash"] == content_hash
+                and (entry["output"] is None or os.path.exists(entry["output"]))
+            ):
+                # Touched but not modified — refresh stat only, keep the render
+                entry["size"] = stat.st_size
+                entry["mtime_ns"] = stat.st_mtime_ns
+                record_change()
+                continue
+
+            output_path = self._output_path(rel)
+            ascii_art = self._render(rel)
+            if ascii_art is None:
+                changes["failed"].append(rel)
+                try:
+                    self._remove_output(output_path)
+                    # Remember the failure by hash so it is not retried every poll
+                    output, recorded_hash = None, content_hash
+                except OSError:
+                    # The old render is still there — keep it pending so the
+                    # next pass tries the removal again
+                    output, recorded_hash = output_path, None
+            else:
+                try:
+                    self._write_output(output_path, ascii_art)
+                    changes["converted"].append(rel)
+                    output, recorded_hash = output_path, content_hash
+                except OSError:
+                    # Disk full, permissions, ... — keep it pending so the
+                    # next pass tries again
+                    changes["failed"].append(rel)
+                    output, recorded_hash = output_path, None
+
+            files[rel] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": recorded_hash,
+                "output": output,
+            }
+            record_change()
+
+        if unsaved:
+            self._save_manifest()
+        return changes
+
+    def watch(self, interval=2.0, stop_event=None, on_change=None, on_error=None):
+        """
+        Poll source_dir every `interval` seconds until stop_event is set.
+        on_change, if given, is called with the sync() result whenever a
+        pass converted, removed or failed at least one file. A pass that
+        raises is passed to on_error, if given, and polling carries on.
+        """
+        if not interval > 0:
+            raise ValueError("interval must be greater than 0")
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            try:
+                changes = self.sync()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+            else:
+                if on_change and any(changes.values()):
+                    on_change(changes)
+            stop_event.wait(interval)
+
+
+def positive_int(value):
+    """argparse type for --width: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def positive_float(value):
+    """argparse type for --interval: a number of seconds greater than 0."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    if not number > 0:
+        raise argparse.ArgumentTypeError("must be greater than 0")
+    return number
+
+
+def main(argv=None):
+    """Command-line entry point for long-running watch mode."""
+    parser = argparse.ArgumentParser(
+        description="Keep a folder of ASCII renders in sync with a folder of images."
+    )
+    parser.add_argument("source_dir", help="Folder of source images to watch")
+    parser.add_argument("output_dir", help="Folder to write .txt renders into")
+    parser.add_argument("--charset", default=DEFAULT_CHARSET, help="Brightness charset (dark → light)")
+    parser.add_argument("--width", type=positive_int, default=50, help="Output width in characters")
+    parser.add_argument("--interval", type=positive_float, default=2.0, help="Seconds between polls")
+    parser.add_argument("--once", action="store_true", help="Run a single sync pass and exit")
+    args = parser.parse_args(argv)
+
+    watcher = FolderWatcher(args.source_dir, args.output_dir, args.charset, args.width)
+
+    def report(changes):
+        for kind in ("converted", "removed", "failed"):
+            for rel in changes[kind]:
+                print(f"{kind}: {rel}")
+
+    def report_error(error):
+        print(f"sync failed: {error}", file=sys.stderr)
+
+    if args.once:
+        report(watcher.sync())
+        return
+    try:
+        watcher.watch(args.interval, on_change=report, on_error=report_error)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()